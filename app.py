@@ -32,6 +32,11 @@ app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
 db = SQLAlchemy(app)
 bcrypt = Bcrypt(app)
+
+# Single-node SQLite fallback: WAL + pragmas, optional write coalescing
+from sqlite_tuning import configure_sqlite
+app.config["SQLITE_WRITE_COALESCING"] = os.getenv("SQLITE_WRITE_COALESCING", "0") == "1"
+write_coalescer = configure_sqlite(app, db)
 from flask_migrate import Migrate
 migrate = Migrate(app, db)
 
@@ -84,6 +89,15 @@ class Cardio(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
 
+def save_new_entry(entry):
+    """Inserts a new row, through the SQLite write coalescer when it's enabled."""
+    if write_coalescer:
+        write_coalescer.submit(entry)
+    else:
+        db.session.add(entry)
+        db.session.commit()
+
+
 # ---------------- ROUTES ----------------
 @app.route('/')
 def index():
@@ -152,8 +166,7 @@ def progress():
             reps=int(reps),
             user_id=current_user.id
         )
-        db.session.add(new_entry)
-        db.session.commit()
+        save_new_entry(new_entry)
         flash("Progress submitted!", "success")
         return redirect(url_for('progress'))
 
@@ -239,8 +252,7 @@ def cardio():
             distance=float(distance) if distance else None,
             user_id=current_user.id
         )
-        db.session.add(new_entry)
-        db.session.commit()
+        save_new_entry(new_entry)
         flash("Cardio entry submitted!", "success")
         return redirect(url_for('cardio'))
 
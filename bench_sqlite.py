@@ -0,0 +1,115 @@
+"""Concurrency benchmark: default SQLite settings vs the tuned SQLite profile.
+
+Emulates several gunicorn workers (processes), each with a few threads,
+all inserting one-row commits like the add-entry routes do.
+
+    python bench_sqlite.py --workers 4 --threads 4 --rows 200
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.exc import OperationalError
+
+from sqlite_tuning import configure_sqlite
+
+PROFILES = ["default", "tuned", "tuned+coalesce"]
+
+
+def make_app(db_path, profile):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db = SQLAlchemy(app)
+
+    class Progress(db.Model):
+        __tablename__ = "progress"
+        id = db.Column(db.Integer, primary_key=True)
+        date = db.Column(db.String(10))
+        exercise = db.Column(db.String(100))
+        weight = db.Column(db.Integer)
+        reps = db.Column(db.Integer)
+        user_id = db.Column(db.Integer, nullable=False)
+
+    coalescer = None
+    if profile != "default":
+        app.config["SQLITE_WRITE_COALESCING"] = profile == "tuned+coalesce"
+        coalescer = configure_sqlite(app, db)
+    return app, db, Progress, coalescer
+
+
+def run_worker(db_path, profile, threads, rows, results):
+    app, db, Progress, coalescer = make_app(db_path, profile)
+    counts = {"ok": 0, "locked": 0}
+    counts_lock = threading.Lock()
+
+    def insert_rows(thread_id):
+        for i in range(rows):
+            entry = Progress(date="2025-01-01", exercise="Bench", weight=100 + i, reps=5, user_id=thread_id)
+            try:
+                if coalescer:
+                    coalescer.submit(entry)
+                else:
+                    with app.app_context():
+                        db.session.add(entry)
+                        db.session.commit()
+                key = "ok"
+            except OperationalError:
+                key = "locked"
+            with counts_lock:
+                counts[key] += 1
+
+    pool = [threading.Thread(target=insert_rows, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    results.put(counts)
+
+
+def run_profile(profile, workers, threads, rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        app, db, _, _ = make_app(db_path, profile)
+        with app.app_context():
+            db.create_all()
+            db.engine.dispose()
+
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=run_worker, args=(db_path, profile, threads, rows, results))
+                 for _ in range(workers)]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        totals = {"ok": 0, "locked": 0}
+        for _ in procs:
+            for key, value in results.get().items():
+                totals[key] += value
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+    return totals, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4, help="processes (gunicorn workers)")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    parser.add_argument("--rows", type=int, default=200, help="inserts per thread")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=PROFILES)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.threads} threads x {args.rows} one-row inserts")
+    print(f"{'profile':<16}{'committed':>10}{'locked':>8}{'seconds':>10}{'rows/s':>10}")
+    for profile in args.profiles:
+        totals, elapsed = run_profile(profile, args.workers, args.threads, args.rows)
+        print(f"{profile:<16}{totals['ok']:>10}{totals['locked']:>8}{elapsed:>10.2f}{totals['ok'] / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import queue
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+# ---------------- SQLITE PROFILE ----------------
+# Defaults for the single-node SQLite fallback (no DATABASE_URL).
+# Each can be overridden through app.config before configure_sqlite() runs.
+SQLITE_DEFAULTS = {
+    "SQLITE_BUSY_TIMEOUT_MS": 5000,          # wait for a lock instead of failing
+    "SQLITE_MMAP_SIZE": 64 * 1024 * 1024,    # 64 MB memory-mapped reads
+    "SQLITE_CACHE_SIZE_KB": 16 * 1024,       # 16 MB page cache per connection
+    "SQLITE_WRITE_COALESCING": False,
+    "SQLITE_COALESCE_MAX_BATCH": 64,
+    "SQLITE_COALESCE_MAX_DELAY_MS": 5,
+    "SQLITE_COALESCE_SUBMIT_TIMEOUT_S": 10,  # keep below gunicorn --timeout (30 s)
+}
+
+
+def sqlite_pragmas(busy_timeout_ms, mmap_size, cache_size_kb):
+    """Returns the PRAGMA statements applied to every new SQLite connection."""
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(busy_timeout_ms)}",
+        f"PRAGMA mmap_size={int(mmap_size)}",
+        f"PRAGMA cache_size=-{int(cache_size_kb)}",  # negative = size in KiB
+    ]
+
+
+def apply_sqlite_pragmas(engine, busy_timeout_ms=5000, mmap_size=64 * 1024 * 1024, cache_size_kb=16 * 1024):
+    """Runs the tuned pragmas on each connection the engine's pool opens."""
+    pragmas = sqlite_pragmas(busy_timeout_ms, mmap_size, cache_size_kb)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return engine
+
+
+def configure_sqlite(app, db):
+    """Applies the SQLite profile to db's engine and returns a WriteCoalescer or None."""
+    for key, value in SQLITE_DEFAULTS.items():
+        app.config.setdefault(key, value)
+
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name != "sqlite":
+            return None
+        apply_sqlite_pragmas(
+            engine,
+            busy_timeout_ms=app.config["SQLITE_BUSY_TIMEOUT_MS"],
+            mmap_size=app.config["SQLITE_MMAP_SIZE"],
+            cache_size_kb=app.config["SQLITE_CACHE_SIZE_KB"],
+        )
+
+    if not app.config["SQLITE_WRITE_COALESCING"]:
+        return None
+    return WriteCoalescer(
+        app, db,
+        max_batch=app.config["SQLITE_COALESCE_MAX_BATCH"],
+        max_delay=app.config["SQLITE_COALESCE_MAX_DELAY_MS"] / 1000.0,
+        submit_timeout=app.config["SQLITE_COALESCE_SUBMIT_TIMEOUT_S"],
+    )
+
+
+# ---------------- WRITE COALESCING ----------------
+class _PendingWrite:
+    def __init__(self, obj):
+        self.obj = obj
+        self.done = threading.Event()
+        self.committed = False
+        self.cancelled = False
+        self.error = None
+
+
+class WriteCoalescer:
+    """Groups small inserts from concurrent requests into one transaction.
+
+    submit() blocks until the row is committed, so callers keep the same
+    read-your-writes behaviour as db.session.add() + db.session.commit().
+    Only coalesces within a process: it helps threaded workers (e.g.
+    gunicorn --threads), not separate sync worker processes. Experimental:
+    the max_delay wait adds latency to every insert and can make it slower
+    than the tuned pragmas alone.
+
+    A write that times out is cancelled unless the worker has already
+    started committing it, in which case the caller waits for that commit's
+    outcome. Either way a timed-out request never leaves a row behind.
+    """
+
+    def __init__(self, app, db, max_batch=64, max_delay=0.005, submit_timeout=10):
+        self.app = app
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.submit_timeout = submit_timeout
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        # Held while committing, so a timeout and a commit can't both win.
+        self._state_lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, obj):
+        """Queues a new (transient) model instance and waits for its commit."""
+        self._ensure_worker()
+        pending = _PendingWrite(obj)
+        self._queue.put(pending)
+        if not pending.done.wait(self.submit_timeout):
+            with self._state_lock:
+                if not pending.committed and pending.error is None:
+                    pending.cancelled = True
+                    raise TimeoutError(f"SQLite write not committed within {self.submit_timeout}s")
+        if pending.error is not None:
+            raise pending.error
+
+    def _ensure_worker(self):
+        # Started lazily so a thread never crosses a gunicorn pre-fork.
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="sqlite-write-coalescer", daemon=True)
+                self._worker.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get(timeout=self.max_delay))
+            except queue.Empty:
+                break
+        with self._state_lock:
+            return [pending for pending in batch if not pending.cancelled]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                with self.app.app_context():
+                    try:
+                        self._commit(batch)
+                    finally:
+                        self.db.session.remove()
+            except Exception as e:
+                # Anything not recorded yet failed with the batch.
+                for pending in batch:
+                    if not pending.committed and pending.error is None:
+                        pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+    def _commit(self, batch):
+        session = self.db.session
+        with self._state_lock:
+            batch = [pending for pending in batch if not pending.cancelled]
+            try:
+                session.add_all([pending.obj for pending in batch])
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+            else:
+                for pending in batch:
+                    pending.committed = True
+                return
+
+        # A bad row shouldn't fail its neighbours: retry them one by one.
+        # Other errors (e.g. "database is locked") propagate and fail the rest.
+        for pending in batch:
+            with self._state_lock:
+                if pending.cancelled:
+                    continue
+                session.add(pending.obj)
+                try:
+                    session.commit()
+                except IntegrityError as e:
+                    session.rollback()
+                    pending.error = e
+                else:
+                    pending.committed = True
@@ -0,0 +1,198 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+
+from sqlite_tuning import WriteCoalescer, configure_sqlite
+
+
+def make_app(db_url, **config):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = db_url
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config.update(config)
+    db = SQLAlchemy(app)
+
+    class Entry(db.Model):
+        __tablename__ = "entries"
+        id = db.Column(db.Integer, primary_key=True)
+        user_id = db.Column(db.Integer, nullable=False)
+
+    return app, db, Entry
+
+
+@pytest.fixture
+def sqlite_app(tmp_path):
+    app, db, Entry = make_app(f"sqlite:///{tmp_path / 'test.db'}")
+    with app.app_context():
+        db.create_all()
+    yield app, db, Entry
+    with app.app_context():
+        db.engine.dispose()
+
+
+def submit_all(coalescer, entries):
+    """Submits entries from separate threads so they land in one batch."""
+    errors = {}
+
+    def submit(i, entry):
+        try:
+            coalescer.submit(entry)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=submit, args=(i, e)) for i, e in enumerate(entries)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+def count(app, db, Entry):
+    with app.app_context():
+        return db.session.query(Entry).count()
+
+
+# ---------------- PRAGMAS ----------------
+def test_pragmas_set_on_pooled_connection(tmp_path):
+    app, db, _ = make_app(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        SQLITE_BUSY_TIMEOUT_MS=1234,
+        SQLITE_MMAP_SIZE=1024 * 1024,
+        SQLITE_CACHE_SIZE_KB=2048,
+    )
+    assert configure_sqlite(app, db) is None
+
+    with app.app_context():
+        def pragma(name):
+            return db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == 1234
+        assert pragma("mmap_size") == 1024 * 1024
+        assert pragma("cache_size") == -2048
+        assert pragma("foreign_keys") == 0
+        db.engine.dispose()
+
+
+def test_non_sqlite_url_returns_none():
+    app, db, _ = make_app("postgresql://user:pw@localhost/db", SQLITE_WRITE_COALESCING=True)
+    assert configure_sqlite(app, db) is None
+
+
+def test_coalescing_enabled_returns_coalescer(tmp_path):
+    app, db, _ = make_app(f"sqlite:///{tmp_path / 'test.db'}", SQLITE_WRITE_COALESCING=True)
+    assert isinstance(configure_sqlite(app, db), WriteCoalescer)
+    with app.app_context():
+        db.engine.dispose()
+
+
+# ---------------- WRITE COALESCING ----------------
+def test_bad_row_fails_only_its_caller(sqlite_app):
+    app, db, Entry = sqlite_app
+    coalescer = WriteCoalescer(app, db, max_delay=0.2)
+
+    entries = [Entry(user_id=1), Entry(user_id=None), Entry(user_id=3)]
+    errors = submit_all(coalescer, entries)
+
+    assert list(errors) == [1]
+    assert isinstance(errors[1], IntegrityError)
+    assert count(app, db, Entry) == 2
+
+
+def test_failed_commit_fails_every_caller(sqlite_app, monkeypatch):
+    app, db, Entry = sqlite_app
+    coalescer = WriteCoalescer(app, db, max_delay=0.2)
+
+    calls = []
+
+    def locked(self):
+        calls.append(1)
+        raise OperationalError("COMMIT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(Session, "commit", locked)
+    errors = submit_all(coalescer, [Entry(user_id=i) for i in range(1, 4)])
+    monkeypatch.undo()
+
+    assert len(errors) == 3
+    assert all(isinstance(e, OperationalError) for e in errors.values())
+    assert len(calls) == 1  # no row-by-row retry on a locked database
+    assert count(app, db, Entry) == 0
+
+
+def test_failed_rollback_fails_every_caller(sqlite_app, monkeypatch):
+    app, db, Entry = sqlite_app
+    coalescer = WriteCoalescer(app, db, max_delay=0.2)
+
+    def bad_row(self):
+        raise IntegrityError("INSERT", {}, Exception("bad row"))
+
+    def broken(self):
+        raise OperationalError("ROLLBACK", {}, Exception("disk I/O error"))
+
+    monkeypatch.setattr(Session, "commit", bad_row)
+    monkeypatch.setattr(Session, "rollback", broken)
+    monkeypatch.setattr(Session, "close", broken)
+    errors = submit_all(coalescer, [Entry(user_id=i) for i in range(1, 4)])
+    monkeypatch.undo()
+
+    assert len(errors) == 3
+    assert all(isinstance(e, OperationalError) for e in errors.values())
+
+    # The worker survives and later writes still go through.
+    coalescer.submit(Entry(user_id=4))
+    assert count(app, db, Entry) == 1
+
+
+def test_submit_times_out(sqlite_app, monkeypatch):
+    app, db, Entry = sqlite_app
+    coalescer = WriteCoalescer(app, db, submit_timeout=0.1)
+    monkeypatch.setattr(coalescer, "_ensure_worker", lambda: None)
+
+    with pytest.raises(TimeoutError):
+        coalescer.submit(Entry(user_id=1))
+
+
+def test_timed_out_write_is_not_committed(sqlite_app, monkeypatch):
+    app, db, Entry = sqlite_app
+    coalescer = WriteCoalescer(app, db, max_delay=0.01, submit_timeout=0.1)
+    release = threading.Event()
+    next_batch = coalescer._next_batch
+
+    def blocked_next_batch():
+        release.wait()
+        return next_batch()
+
+    monkeypatch.setattr(coalescer, "_next_batch", blocked_next_batch)
+    with pytest.raises(TimeoutError):
+        coalescer.submit(Entry(user_id=1))
+
+    # Once released, the worker skips the cancelled write but still serves others.
+    release.set()
+    coalescer.submit_timeout = 5
+    coalescer.submit(Entry(user_id=2))
+    with app.app_context():
+        assert [e.user_id for e in db.session.query(Entry)] == [2]
+
+
+def test_timeout_during_commit_reports_commit(sqlite_app, monkeypatch):
+    app, db, Entry = sqlite_app
+    coalescer = WriteCoalescer(app, db, submit_timeout=0.1)
+    commit = Session.commit
+
+    def slow_commit(self):
+        time.sleep(0.3)
+        commit(self)
+
+    monkeypatch.setattr(Session, "commit", slow_commit)
+    coalescer.submit(Entry(user_id=1))  # commit already in flight: no TimeoutError
+    monkeypatch.undo()
+
+    assert count(app, db, Entry) == 1